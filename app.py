@@ -1,36 +1,90 @@
 import os
+import asyncio
+import hashlib
+import logging
+import logging.handlers
+import queue
 import tempfile
-import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from fastapi import FastAPI, File, UploadFile, Request, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
 from pathlib import Path
+import aiofiles
+from jinja2 import FileSystemBytecodeCache
 from extraction_complete import extraction_complete_ehf
-import shutil
+
+# Journalisation : les messages passent par une file vidée par un thread dédié,
+# pour que les requêtes n'attendent jamais l'écriture sur stdout
+logger = logging.getLogger("ehf")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_listener_pid = None
+
+def setup_logging():
+    """Brancher le logger "ehf" sur sa file d'attente (une fois par processus)."""
+    global log_listener_pid
+    if log_listener_pid == os.getpid():
+        return
+    # Après un fork, le thread d'écoute du parent n'existe plus : en recréer un
+    log_queue = queue.SimpleQueue()
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    log_listener_pid = os.getpid()
+
+setup_logging()
 
 # Application FastAPI pour l'analyse EHF
-app = FastAPI(title="Analyseur EHF", description="Interface d'analyse des documents EHF")
+app = FastAPI(
+    title="Analyseur EHF",
+    description="Interface d'analyse des documents EHF",
+    default_response_class=ORJSONResponse,
+)
 
-# CORS
+# CORS : origines autorisées explicites (séparées par des virgules dans EHF_CORS)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=os.environ.get("EHF_CORS", "http://localhost:1000").split(","),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
 )
 
+# Compression des réponses (pages de résultats volumineuses et répétitives)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configurations
 UPLOAD_FOLDER = Path("uploads_ehf")
 UPLOAD_FOLDER.mkdir(exist_ok=True)
-ALLOWED_EXTENSIONS = {"pdf"}
+ALLOWED_EXTENSIONS = frozenset({"pdf"})
+ALLOWED_SUFFIXES = tuple("." + ext for ext in ALLOWED_EXTENSIONS)
 MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB
+MAX_REQUEST_SIZE = MAX_CONTENT_LENGTH + 1024 * 1024  # Fichier + enveloppe multipart
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+WARMUP_PDF = Path(__file__).parent / "fixtures" / "tiny.pdf"
+RESULT_CACHE_SIZE = 128  # Nombre d'analyses gardées en mémoire
 
-# Templates et static
-templates = Jinja2Templates(directory="templates")
+# Cache LRU des analyses, indexé par l'empreinte SHA-256 du PDF
+result_cache = OrderedDict()
+
+# Templates et static : bytecode Jinja2 mis en cache sur disque, pas de revérification
+# des fichiers à chaque rendu (sauf en développement avec EHF_DEV=1)
+JINJA_CACHE_DIR = Path(".jinja_cache")
+JINJA_CACHE_DIR.mkdir(exist_ok=True)
+templates = Jinja2Templates(
+    directory="templates",
+    bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+    auto_reload=bool(os.environ.get("EHF_DEV")),
+)
 
 # Créer le dossier static s'il n'existe pas
 static_dir = Path("static")
@@ -39,24 +93,164 @@ static_dir.mkdir(exist_ok=True)
 # Monter les fichiers statiques
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+class RejectOversizedUploads:
+    """Refuser (413) les uploads de plus de MAX_REQUEST_SIZE octets, sans recevoir le surplus."""
+
+    # Middleware ASGI pur : seul POST /analyze est examiné, le reste (static, santé...)
+    # passe directement à l'application. Un Content-Length trop grand est refusé avant
+    # toute lecture ; sinon (envoi par morceaux) les octets sont comptés à la réception
+    # et la lecture s'arrête dès que la limite est dépassée
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not (scope["type"] == "http" and scope["method"] == "POST" and scope["path"] == "/analyze"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_REQUEST_SIZE:
+            await self.reject(scope, receive, send)
+            return
+
+        received = 0
+        too_large = False
+
+        async def limited_receive():
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > MAX_REQUEST_SIZE:
+                    too_large = True
+                    raise HTTPException(status_code=413)
+            return message
+
+        async def guarded_send(message):
+            # Limite dépassée : la réponse d'erreur de l'application est remplacée par la page 413
+            if not too_large:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not too_large:
+                raise
+        if too_large:
+            await self.reject(scope, receive, send)
+
+    @staticmethod
+    async def reject(scope, receive, send):
+        """Renvoyer le formulaire d'upload avec l'erreur de taille (413)."""
+        response = templates.TemplateResponse(
+            "ehf_upload.html",
+            {"request": Request(scope), "error": "Fichier trop volumineux (max 50 Mo)."},
+            status_code=413,
+        )
+        await response(scope, receive, send)
+
+app.add_middleware(RejectOversizedUploads)
+
+def warmup_extraction():
+    """Préchauffer l'extraction sur un petit PDF avant la première requête."""
+    if not WARMUP_PDF.exists():
+        return
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            extraction_complete_ehf(str(WARMUP_PDF), output_dir=tmp_dir)
+        logger.info("🔥 Extraction EHF préchauffée")
+    except Exception as e:
+        logger.warning("⚠️  Échec du préchauffage de l'extraction : %s", e)
+
+def init_extraction_worker():
+    """Initialiser un worker d'extraction : journalisation puis préchauffage."""
+    setup_logging()
+    warmup_extraction()
+
+# Pool de processus pour l'extraction (CPU) : chaque worker est préchauffé à son lancement.
+# Sous gunicorn, EHF_EXTRACTION_WORKERS répartit les cœurs entre les workers web.
+EXTRACTION_WORKERS = int(os.environ.get("EHF_EXTRACTION_WORKERS") or min(8, os.cpu_count() or 1))
+
+def create_extraction_pool() -> ProcessPoolExecutor:
+    """Créer le pool de workers d'extraction."""
+    return ProcessPoolExecutor(
+        max_workers=EXTRACTION_WORKERS,
+        initializer=init_extraction_worker,
+    )
+
+EXTRACTION_POOL = create_extraction_pool()
+
+def replace_broken_pool(broken_pool: ProcessPoolExecutor):
+    """Remplacer le pool cassé par la mort d'un worker (OOM, crash de pdfminer...)."""
+    global EXTRACTION_POOL
+    # Un pool cassé le reste ; plusieurs requêtes peuvent constater la même panne,
+    # seule la première le remplace
+    if EXTRACTION_POOL is broken_pool:
+        logger.warning("⚠️  Pool d'extraction cassé, création d'un nouveau pool")
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+        EXTRACTION_POOL = create_extraction_pool()
+
+@app.on_event("startup")
+def start_extraction_pool():
+    """Lancer les workers d'extraction dès le démarrage plutôt qu'à la première requête."""
+    EXTRACTION_POOL.submit(os.getpid)
+
+@app.on_event("startup")
+def warmup_templates():
+    """Compiler les templates au démarrage plutôt qu'au premier rendu."""
+    for template_name in ("ehf_upload.html", "ehf_result.html"):
+        templates.get_template(template_name)
+
+@app.on_event("shutdown")
+def stop_extraction_pool():
+    """Arrêter les workers d'extraction."""
+    EXTRACTION_POOL.shutdown(wait=False, cancel_futures=True)
+
 def allowed_file(filename: str) -> bool:
     """Vérifier si le fichier est autorisé."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
+
+def get_cached_result(digest: str):
+    """Récupérer une analyse déjà effectuée pour ce contenu de PDF."""
+    result = result_cache.get(digest)
+    if result is not None:
+        result_cache.move_to_end(digest)
+    return result
+
+def cache_result(digest: str, result: dict):
+    """Mémoriser une analyse en évinçant la plus ancienne au-delà de RESULT_CACHE_SIZE."""
+    result_cache[digest] = result
+    result_cache.move_to_end(digest)
+    if len(result_cache) > RESULT_CACHE_SIZE:
+        result_cache.popitem(last=False)
+
+# Dernier horodatage formaté : (seconde epoch, chaîne "JJ/MM/AAAA HH:MM:SS")
+last_timestamp = (0, "")
+
+def current_timestamp() -> str:
+    """Date/heure courante formatée, recalculée au plus une fois par seconde."""
+    global last_timestamp
+    second = int(time.time())
+    if second != last_timestamp[0]:
+        last_timestamp = (second, datetime.fromtimestamp(second).strftime("%d/%m/%Y %H:%M:%S"))
+    return last_timestamp[1]
 
 def process_ehf_document(pdf_path: str, filename: str):
     """Traiter le document EHF avec notre système d'extraction."""
     try:
-        print(f"🚀 Début de l'analyse EHF pour : {filename}")
+        logger.info("🚀 Début de l'analyse EHF pour : %s", filename)
         
-        # Utiliser notre système d'extraction complet
-        result = extraction_complete_ehf(pdf_path)
+        # Utiliser notre système d'extraction complet ; les fichiers JSON produits
+        # (noms, dates de naissance) ne servent pas ici et disparaissent avec le dossier
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = extraction_complete_ehf(pdf_path, output_dir=tmp_dir)
         
-        print(f"✅ Analyse terminée avec succès pour : {filename}")
+        logger.info("✅ Analyse terminée avec succès pour : %s", filename)
         
         # Structurer les résultats pour l'interface
         structured_result = {
             "filename": filename,
-            "date_analyse": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            "date_analyse": current_timestamp(),
             "statistiques": {
                 "nb_formalites": result["nb_formalites"],
                 "nb_mutations": result["nb_mutations"],
@@ -74,7 +268,7 @@ def process_ehf_document(pdf_path: str, filename: str):
         
     except Exception as e:
         error_msg = f"Erreur lors de l'analyse EHF: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return None, error_msg
 
 @app.get("/", response_class=HTMLResponse)
@@ -100,28 +294,52 @@ async def analyze_ehf(request: Request, file: UploadFile = File(...)):
         return templates.TemplateResponse(
             "ehf_upload.html",
             {"request": request, "error": "Fichier trop volumineux (max 50 Mo)."},
+            status_code=413,
         )
 
-    # Sauvegarder temporairement le fichier
-    filename = file.filename
-    filepath = UPLOAD_FOLDER / filename
+    # Sauvegarder temporairement le fichier sous un nom unique (uploads simultanés
+    # de fichiers homonymes, noms du type "../x.pdf") ; le nom d'origine sert à l'affichage
+    filename = os.path.basename(file.filename)
+    with tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, suffix=".pdf", delete=False) as tmp:
+        filepath = Path(tmp.name)
 
     try:
-        # Écrire le fichier
-        with open(filepath, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Écrire le fichier par morceaux pour ne jamais charger tout le PDF en mémoire
+        # (la taille est déjà bornée à la réception par RejectOversizedUploads)
+        sha256 = hashlib.sha256()
+        async with aiofiles.open(filepath, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                sha256.update(chunk)
+                await f.write(chunk)
 
-        # Traiter le document EHF
-        result, error = process_ehf_document(str(filepath), filename)
+        # Un PDF identique déjà analysé : réutiliser le résultat, avec le nom et la date
+        # de cet upload
+        digest = sha256.hexdigest()
+        cached = get_cached_result(digest)
+        if cached is not None:
+            result, error = dict(cached, filename=filename, date_analyse=current_timestamp()), None
+        else:
+            # Traiter le document EHF dans un worker pour ne pas bloquer la boucle d'événements
+            pool = EXTRACTION_POOL
+            try:
+                result, error = await asyncio.get_running_loop().run_in_executor(
+                    pool, process_ehf_document, str(filepath), filename
+                )
+            except BrokenProcessPool:
+                logger.error("❌ Worker d'extraction interrompu pendant l'analyse de : %s", filename)
+                replace_broken_pool(pool)
+                result, error = None, "Erreur lors de l'analyse EHF: le traitement du document a été interrompu."
+            if result:
+                cache_result(digest, result)
         
     finally:
-        # Supprimer le fichier temporaire
+        # Supprimer le fichier temporaire (un échec ne doit pas faire perdre l'analyse)
         try:
-            if filepath.exists():
-                filepath.unlink()
-        except:
+            os.unlink(filepath)
+        except FileNotFoundError:
             pass
+        except OSError as e:
+            logger.warning("⚠️  Impossible de supprimer le fichier temporaire %s : %s", filepath, e)
 
     if error:
         return templates.TemplateResponse(
@@ -137,10 +355,20 @@ async def analyze_ehf(request: Request, file: UploadFile = File(...)):
 @app.get("/api/health")
 async def health_check():
     """Point de contrôle de santé de l'API."""
-    return {"status": "ok", "service": "Analyseur EHF"}
+    # Réponse construite directement : pas de passage par jsonable_encoder
+    return ORJSONResponse({"status": "ok", "service": "Analyseur EHF"})
 
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Démarrage de l'application EHF...")
     print("📋 Interface disponible sur : http://localhost:1000")
-    uvicorn.run("app:app", host="0.0.0.0", port=1000, reload=True)
+    # Boucle libuv (uvloop) et parseur HTTP en C (httptools), fournis par uvicorn[standard] ;
+    # rechargement automatique uniquement en développement (EHF_DEV=1)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=1000,
+        reload=bool(os.environ.get("EHF_DEV")),
+        loop="uvloop",
+        http="httptools",
+    )
@@ -3,14 +3,118 @@
 Extracteur complet EHF - Combine l'extraction des formalités ET du tableau de la dernière page
 """
 
-import pdfplumber
-import json
+import logging
 import re
+import sys
 import unicodedata
-from typing import List, Dict, Any
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Dict, Any, BinaryIO, Union
 from pathlib import Path
+import orjson
 from PyPDF2 import PdfReader
 
+log = logging.getLogger(__name__)
+
+# Expressions régulières compilées une seule fois au chargement du module
+_WS_RE = re.compile(r"[\s\u00A0\u202F]+")
+
+# Formalités (extract_formalites_from_pdf)
+_DEPOT_RE = re.compile(r"Date de d[eé]p[oô]t\s*:", re.IGNORECASE)
+# Les quatre champs d'une formalité, lus en un seul passage (premier résultat par champ).
+# Chaque alternative est un lookahead : rien n'est consommé, donc un champ contenu dans
+# un autre (ex. "Date de l'acte" sur la ligne de la référence) reste trouvable,
+# exactement comme avec quatre recherches indépendantes. La référence est capturée
+# sans les espaces qui l'entourent.
+_CHAMPS_FORMALITE_RE = re.compile(
+    r"(?=Nature de l'acte\s*:\s*(?P<nature>.+?)(?:\n|Rédacteur))"
+    r"|(?=Date de l'acte\s*:\s*(?P<date_acte>\d{2}/\d{2}/\d{4}))"
+    r"|(?=Réference d'enliassement\s*:\s*(?P<ref>\S[^\n]*?)\s*(?:\n|\Z))"
+    r"|(?=(?P<date_depot>\d{2}/\d{2}/\d{4}))",
+    re.IGNORECASE | re.DOTALL,
+)
+_REF_CLEAN_RE = re.compile(r'\s+Date de l\'acte\s*:\s*\d{2}/\d{2}/\d{4}')
+
+# En-têtes sans lesquels extraire_mutations ne peut rien trouver (analyser_mutations)
+_MOTS_CLES_MUTATION = ("DISPOSANT", "DONATEUR", "BÉNÉFICIAIRE", "DONATAIRE", "IMMEUBLES")
+
+# Hypothèques (analyser_hypotheques_actives)
+_DATE_RE = re.compile(r"\d{2}/\d{2}/\d{4}")
+
+# Mutations (extraire_mutations)
+_PERSONNE_RE = re.compile(r'(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})')
+# Un seul passage par rôle : le premier en-tête trouvé (Disposant, Donateur ou les deux) l'emporte
+_DISPOSANT_RE = re.compile(
+    r"(?:Disposant[,\s]*Donateur|Disposant|Donateur)\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Bénéficiaire|\n\s*Immeubles|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_DISPOSANT_SIMPLE_RE = re.compile(r"Disposant.*?\n.*?(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})", re.IGNORECASE | re.DOTALL)
+_BENEFICIAIRE_RE = re.compile(
+    r"(?:Bénéficiaire[,\s]*Donataire|Bénéficiaire|Donataire)\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Immeubles|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_BENEFICIAIRE_SIMPLE_RE = re.compile(r"Bénéficiaire.*?\n.*?(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})", re.IGNORECASE | re.DOTALL)
+# Couvre aussi le format simplifié (en-tête juste sous "Immeubles", comme dans EHF8)
+_IMMEUBLES_MUTATION_RE = re.compile(
+    r"Immeubles\s*.*?Bénéficiaires\s+Droits\s+Commune\s+Désignation cadastrale\s+Volume\s+Lot\s*\n(.*?)(?=\n\s*US\s*:|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+# Lignes du tableau, lots sur lignes séparées. Droits courts (PP, US, NP/US...) essayés
+# d'abord, puis droits longs (USUFRUIT...), dans un seul passage sur le tableau.
+# Une ligne commence en début de ligne et ne déborde pas sur la suivante ; les lots
+# sont les lignes qui ne contiennent qu'un numéro (pas le numéro de la ligne suivante)
+_LIGNE_IMMEUBLE_RE = re.compile(
+    r'^[ \t]*(\d+(?:[ \t]+à[ \t]+\d+)?)[ \t]+([A-Z/]{1,3}|[A-Z]{2,})[ \t]+([A-Z \t\d]+?)[ \t]+([A-Z]{1,3}[ \t]*\d+)[ \t]*\n'
+    r'((?:\s*\d+[ \t]*(?:\n|\Z))*)',
+    re.MULTILINE,
+)
+_PRIX_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r"Prix/évaluation\s*:\s*([0-9\s,\.]+\s*EUR)",
+    r"Prix\s*:\s*([0-9\s,\.]+\s*EUR)",
+    r"Évaluation\s*:\s*([0-9\s,\.]+\s*EUR)",
+    r"Montant\s*:\s*([0-9\s,\.]+\s*EUR)",
+)]
+
+# Lots, volumes et informations financières (extraire_lots_volumes_hypotheque)
+# Section "Immeubles" jusqu'au montant : début et fin cherchés séparément (deux recherches
+# linéaires au lieu d'un .*? en DOTALL qui teste la fin à chaque caractère)
+_DEBUT_SECTION_IMMEUBLES_RE = re.compile(r"Immeubles\s*", re.IGNORECASE)
+_FIN_SECTION_IMMEUBLES_RE = re.compile(r"\n\s*Montant", re.IGNORECASE)
+_COMMUNE_DESIGNATION_RE = re.compile(r"([A-Z][A-Z\s\d]+?)\s+([A-Z]{1,3}\s*\d+)\s*\n((?:\s*\d+\s*\n?)+)")
+_COMMUNE_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r"([A-Z][A-Z\s\d]+?)\s+[A-Z]{1,3}\s+\d+",  # "PARIS 15 CJ 42"
+    r"Commune[:\s]*([A-Z][A-Z\s\d]+)",  # "Commune: VANVES"
+)]
+_DESIGNATION_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r"([A-Z]{1,3}\s*\d+)(?:\s*\n|\s*$)",  # "CJ 42" suivi d'un saut de ligne
+    r"cadastrale[:\s]*([A-Z]{1,3}\s*\d+)",  # "cadastrale: CJ 42"
+)]
+_LOT_ISOLE_RE = re.compile(r'^\s*(\d+)\s*$', re.MULTILINE)
+_VOLUME_RE = re.compile(r"Volume[:\s]*(\d+|[A-Z]\d+)", re.IGNORECASE)
+# Les cinq champs financiers, lus en un seul passage (premier résultat par champ).
+# Les valeurs ne contiennent que chiffres, espaces, ponctuation, EUR ou % : aucun
+# libellé ne peut commencer à l'intérieur d'une valeur déjà consommée.
+_CHAMPS_FINANCIERS_RE = re.compile(
+    r"Montant principal\s*:\s*(?P<montant_principal>[\d\s,\.]+\s*EUR)"
+    r"|Accessoires\s*:\s*(?P<accessoires>[\d\s,\.]+\s*EUR)"
+    r"|Taux d'intérêt\s*:\s*(?P<taux_interet>[\d,\.]+\s*%)"
+    r"|Date d'extrême exigibilité\s*:\s*(?P<date_extreme_exigibilite>\d{2}/\d{2}/\d{4})"
+    r"|Date d'extrême effet\s*:\s*(?P<date_extreme_effet>\d{2}/\d{2}/\d{4})",
+    re.IGNORECASE,
+)
+_COMPLEMENT_RE = re.compile(
+    r"Complément\s*:\s*(.*?)(?=\n\s*Disposition|\n\s*\d+\s*/\s*\d+\s*Demande|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_SAUTS_LIGNE_RE = re.compile(r'\n+')
+
+# Types d'actes (classifier_type_acte)
+_FORMALITE_RE = re.compile(r'\s+de\s+la\s+formalit[eé]', re.IGNORECASE)
+
+# En-tête du tableau de la dernière page (extract_tableau_derniere_page)
+_EN_TETE_TABLEAU_RE = re.compile(r"CODE|COMMUNE|DESIGNATION", re.IGNORECASE)
+
 def normalize_text(text: str) -> str:
     """Normaliser le texte pour la recherche."""
     # 1. Normaliser les accents/ligatures (fi → fi, é → e)
@@ -18,68 +122,62 @@ def normalize_text(text: str) -> str:
     # 2. Supprimer les diacritiques
     text = "".join(c for c in text if not unicodedata.combining(c))
     # 3. Remplacer les espaces spéciaux et sauts de ligne par un espace normal
-    text = re.sub(r"[\s\u00A0\u202F]+", " ", text)
+    text = _WS_RE.sub(" ", text)
     return text.lower().strip()
 
-def extract_formalites_from_pdf(pdf_path: str) -> List[Dict[str, str]]:
+def extract_formalites_from_pdf(pdf_source: Union[str, BinaryIO]) -> List[Dict[str, str]]:
     """
     Extraire toutes les formalités du PDF basées sur "Date de dépot".
+    Accepte un chemin ou un flux binaire (BytesIO, fichier ouvert en "rb").
     """
     
-    print(f"📋 Extraction des formalités depuis : {pdf_path}")
+    log.info("📋 Extraction des formalités depuis : %s", getattr(pdf_source, "name", pdf_source))
     
     # Extraire tout le texte du PDF avec PyPDF2
-    reader = PdfReader(pdf_path)
-    full_text = ""
+    reader = PdfReader(pdf_source)
+    pages_text = []
     for i, page in enumerate(reader.pages):
-        page_text = page.extract_text() or ""
-        full_text += page_text + "\n"
-        print(f"📄 Page {i+1} extraite pour formalités")
+        pages_text.append(page.extract_text() or "")
+        pages_text.append("\n")
+        log.debug("📄 Page %d extraite pour formalités", i + 1)
+    full_text = "".join(pages_text)
     
-    print(f"📝 Texte complet extrait ({len(full_text)} caractères)")
+    log.info("📝 Texte complet extrait (%d caractères)", len(full_text))
     
-    # Diviser le texte en formalités basées sur "Date de dépot" SANS normalisation
-    # Pattern pour trouver "Date de dépot" (avec variations)
-    depot_pattern = r"Date de d[eé]p[oô]t\s*:"
+    # Découper le texte original (pas normalisé) en formalités basées sur "Date de dépot" :
+    # chaque section va de la fin d'un marqueur au début du suivant (le texte avant le
+    # premier marqueur est ignoré)
+    marqueurs = [(m.start(), m.end()) for m in _DEPOT_RE.finditer(full_text)]
     
-    # Diviser le texte original (pas normalisé) en sections
-    sections = re.split(depot_pattern, full_text, flags=re.IGNORECASE)
-    
-    print(f"🔍 Nombre de sections trouvées : {len(sections)}")
+    log.debug("🔍 Nombre de sections trouvées : %d", len(marqueurs) + 1)
     
     # Construire la liste des formalités
     formalites = []
     
-    for i, section in enumerate(sections):
-        if i == 0:  # Ignorer la première section (avant le premier "Date de dépot")
-            continue
+    for i, (_, debut) in enumerate(marqueurs, start=1):
+        fin = marqueurs[i][0] if i < len(marqueurs) else len(full_text)
         
         # Nettoyer et préparer le contenu (garder la casse originale)
-        contenu = section.strip()
+        contenu = full_text[debut:fin].strip()
         if contenu:  # Seulement si le contenu n'est pas vide
             
-            # Extraire la chaîne entre "Nature de l'acte" et "Rédacteur" (CASSE ORIGINALE)
-            entre_pattern = r"Nature de l'acte\s*:\s*(.+?)(?:\n|Rédacteur)"
-            entre_match = re.search(entre_pattern, contenu, re.IGNORECASE | re.DOTALL)
-            chaine_entre = entre_match.group(1).strip() if entre_match else "Non trouvé"
-            
-            # Extraire la date de dépôt (au début de la section)
-            date_depot_pattern = r"(\d{2}/\d{2}/\d{4})"
-            date_depot_match = re.search(date_depot_pattern, contenu)
-            date_depot = date_depot_match.group(1) if date_depot_match else "Non trouvé"
-            
-            # Extraire la date de l'acte
-            date_acte_pattern = r"Date de l'acte\s*:\s*(\d{2}/\d{2}/\d{4})"
-            date_acte_match = re.search(date_acte_pattern, contenu, re.IGNORECASE)
-            date_acte = date_acte_match.group(1) if date_acte_match else "Non trouvé"
+            # Un seul passage sur le contenu pour les quatre champs :
+            # nature de l'acte (CASSE ORIGINALE), date de dépôt (première date de la section),
+            # date de l'acte et référence d'enliassement
+            champs = {}
+            for champ_match in _CHAMPS_FORMALITE_RE.finditer(contenu):
+                champ = champ_match.lastgroup
+                if champ not in champs:
+                    champs[champ] = champ_match.group(champ)
+                    if len(champs) == 4:
+                        break
             
-            # Extraire la référence d'enliassement
-            ref_enliassement = ""
-            ref_match = re.search(r"Réference d'enliassement\s*:\s*([^\n]+)", contenu, re.IGNORECASE)
-            if ref_match:
-                ref_enliassement = ref_match.group(1).strip()
-                # Nettoyer la référence en enlevant la partie "Date de l'acte" redondante
-                ref_enliassement = re.sub(r'\s+Date de l\'acte\s*:\s*\d{2}/\d{2}/\d{4}', '', ref_enliassement)
+            chaine_entre = champs["nature"].strip() if "nature" in champs else "Non trouvé"
+            date_depot = champs.get("date_depot", "Non trouvé")
+            date_acte = champs.get("date_acte", "Non trouvé")
+            ref_enliassement = champs.get("ref", "")
+            # Nettoyer la référence en enlevant la partie "Date de l'acte" redondante
+            ref_enliassement = _REF_CLEAN_RE.sub('', ref_enliassement)
             
             formalite = {
                 "numero_ordre": i,
@@ -89,46 +187,44 @@ def extract_formalites_from_pdf(pdf_path: str) -> List[Dict[str, str]]:
                 "nature_acte_redacteur": chaine_entre,
                 "reference_enliassement": ref_enliassement
             }
+            # Versions majuscules calculées une fois, réutilisées par les analyses
+            formalite["_nature_upper"] = chaine_entre.upper()
+            formalite["_contenu_upper"] = formalite["contenu"].upper()
             formalites.append(formalite)
     
-    print(f"📋 {len(formalites)} formalités extraites")
+    log.info("📋 %d formalités extraites", len(formalites))
     
-    # Compter les types d'actes
-    comptage_types = {}
-    for formalite in formalites:
-        nature_acte = formalite.get("nature_acte_redacteur", "").strip()  # GARDER LA CASSE ORIGINALE
-        
-        # Nettoyer et normaliser le type d'acte pour le comptage
-        if nature_acte and nature_acte.upper() != "NON TROUVÉ":
-            # Extraire les mots-clés principaux pour classifier les actes
-            type_acte = classifier_type_acte(nature_acte)
-            
-            
-            if type_acte in comptage_types:
-                comptage_types[type_acte] += 1
-            else:
-                comptage_types[type_acte] = 1
+    # Compter les types d'actes (nature en CASSE ORIGINALE, hors natures non trouvées)
+    comptage_types = Counter(
+        classifier_type_acte(formalite["nature_acte_redacteur"])
+        for formalite in formalites
+        if formalite["nature_acte_redacteur"] and formalite["_nature_upper"] != "NON TROUVÉ"
+    )
     
     # Trier par nombre d'occurrences (décroissant)
-    comptage_trie = dict(sorted(comptage_types.items(), key=lambda x: x[1], reverse=True))
+    comptage_trie = dict(comptage_types.most_common())
     
-    print(f"📊 Types d'actes détectés : {len(comptage_trie)}")
+    log.info("📊 Types d'actes détectés : %d", len(comptage_trie))
     for type_acte, count in comptage_trie.items():
-        print(f"   - {type_acte}: {count}")
+        log.debug("   - %s: %d", type_acte, count)
     
     # Analyser les hypothèques actives
     hypotheques_actives = analyser_hypotheques_actives(formalites)
     
-    print(f"🏦 Hypothèques actives détectées : {len(hypotheques_actives)}")
+    log.info("🏦 Hypothèques actives détectées : %d", len(hypotheques_actives))
     for hyp in hypotheques_actives:
-        print(f"   - {hyp['date_depot']} : {hyp['nature_acte']}")
+        log.debug("   - %s : %s", hyp['date_depot'], hyp['nature_acte'])
     
     # Analyser les mutations (formalités autres que hypothèques)
     mutations = analyser_mutations(formalites)
     
-    print(f"🔄 Mutations détectées : {len(mutations)}")
+    log.info("🔄 Mutations détectées : %d", len(mutations))
     for mut in mutations:
-        print(f"   - {mut['date_depot']} : {mut['nature_acte']} ({len(mut['mutations']['disposant_donateur'])} disposants → {len(mut['mutations']['beneficiaire_donataire'])} bénéficiaires)")
+        log.debug("   - %s : %s (%d disposants → %d bénéficiaires)", mut['date_depot'], mut['nature_acte'], len(mut['mutations']['disposant_donateur']), len(mut['mutations']['beneficiaire_donataire']))
+    
+    # Retirer les champs internes avant de renvoyer (et de sauvegarder) les formalités
+    for formalite in formalites:
+        del formalite["_nature_upper"], formalite["_contenu_upper"]
     
     return formalites, comptage_trie, hypotheques_actives, mutations
 
@@ -142,45 +238,33 @@ def analyser_hypotheques_actives(formalites):
     
     # Séparer les hypothèques et les radiations
     for formalite in formalites:
-        nature_acte = formalite.get("nature_acte_redacteur", "").upper()
-        contenu = formalite.get("contenu", "").upper()
+        nature_acte = formalite.get("_nature_upper") or formalite.get("nature_acte_redacteur", "").upper()
         
         # Une radiation est un acte qui contient "RADIATION" et "TOTALE"
         if "RADIATION" in nature_acte and "TOTALE" in nature_acte:
             radiations.append(formalite)
+        elif "HYPOTHEQUE" in nature_acte:
+            # Hypothèque explicite : la nature suffit, inutile de parcourir le contenu
+            hypotheques.append(formalite)
         else:
-            # Une hypothèque est détectée si ce n'est PAS une radiation ET :
-            # 1. Contient "HYPOTHEQUE"
-            # 2. OU contient à la fois "CRÉANCIERS" et ("DÉBITEUR" ou "PROPRIÉTAIRES IMMEUBLE")
-            est_hypotheque_explicite = "HYPOTHEQUE" in nature_acte
-            est_hypotheque_implicite = ("CRÉANCIERS" in contenu and 
-                                       ("DÉBITEUR" in contenu or "PROPRIÉTAIRES IMMEUBLE" in contenu))
-            
-            if est_hypotheque_explicite or est_hypotheque_implicite:
+            # Sinon, hypothèque implicite si le contenu contient à la fois
+            # "CRÉANCIERS" et ("DÉBITEUR" ou "PROPRIÉTAIRES IMMEUBLE")
+            contenu = formalite.get("_contenu_upper") or formalite.get("contenu", "").upper()
+            if "CRÉANCIERS" in contenu and ("DÉBITEUR" in contenu or "PROPRIÉTAIRES IMMEUBLE" in contenu):
                 hypotheques.append(formalite)
-                if est_hypotheque_implicite and not est_hypotheque_explicite:
-                    print(f"   🔍 Hypothèque détectée par critère implicite : {nature_acte}")
+                log.debug("   🔍 Hypothèque détectée par critère implicite : %s", nature_acte)
+    
+    # Dates citées par les radiations totales, collectées une seule fois
+    dates_radiees = set()
+    for radiation in radiations:
+        dates_radiees.update(_DATE_RE.findall(radiation.get("nature_acte_redacteur", "")))
     
     # Vérifier quelles hypothèques sont encore actives
     hypotheques_actives = []
     
     for hypotheque in hypotheques:
-        date_depot_hyp = hypotheque.get("date_depot", "")
-        nature_hyp = hypotheque.get("nature_acte_redacteur", "")
-        
-        # Chercher une radiation correspondante
-        est_radiee = False
-        
-        for radiation in radiations:
-            nature_rad = radiation.get("nature_acte_redacteur", "")
-            
-            # Vérifier si la date de l'hypothèque figure dans la radiation
-            # et que les mots RADIATION et TOTALE sont présents
-            if (date_depot_hyp in nature_rad and 
-                "RADIATION" in nature_rad.upper() and 
-                "TOTALE" in nature_rad.upper()):
-                est_radiee = True
-                break
+        # L'hypothèque est radiée si sa date de dépôt figure dans une radiation
+        est_radiee = hypotheque.get("date_depot", "") in dates_radiees
         
         # Si l'hypothèque n'est pas radiée, elle est active
         if not est_radiee:
@@ -207,10 +291,15 @@ def analyser_mutations(formalites):
     mutations = []
     
     for formalite in formalites:
-        nature_acte = formalite.get("nature_acte_redacteur", "").upper()
+        nature_acte = formalite.get("_nature_upper") or formalite.get("nature_acte_redacteur", "").upper()
         
         # Analyser seulement les formalités qui ne sont pas des hypothèques
         if "HYPOTHEQUE" not in nature_acte and "RADIATION" not in nature_acte:
+            # Sans aucun en-tête de bloc, extraire_mutations ne trouverait rien : on l'évite
+            contenu_upper = formalite.get("_contenu_upper") or formalite.get("contenu", "").upper()
+            if not any(mot in contenu_upper for mot in _MOTS_CLES_MUTATION):
+                continue
+            
             contenu = formalite.get("contenu", "")
             mutations_data = extraire_mutations(contenu)
             
@@ -238,7 +327,7 @@ def reconstituer_propriete(mutations, immeubles):
     if not mutations or not immeubles:
         return []
     
-    print(f"🔍 Analyse de {len(mutations)} mutations pour reconstituer la propriété")
+    log.info("🔍 Analyse de %d mutations pour reconstituer la propriété", len(mutations))
     
     # Récupérer l'immeuble de référence (dernière page)
     immeuble_ref = immeubles[0]  # Premier immeuble extrait
@@ -253,12 +342,12 @@ def reconstituer_propriete(mutations, immeubles):
     commune_ref = immeuble_ref['commune']
     designation_ref = immeuble_ref['designation_cadastrale']
     
-    print(f"🏠 Immeuble de référence : {commune_ref} {designation_ref}")
-    print(f"📋 Lots à reconstituer : {sorted(lots_ref) if lots_ref else 'Aucun lot spécifique'}")
+    log.info("🏠 Immeuble de référence : %s %s", commune_ref, designation_ref)
+    log.info("📋 Lots à reconstituer : %s", sorted(lots_ref) if lots_ref else 'Aucun lot spécifique')
     
     # Si pas de lots dans l'immeuble de référence, essayer de les extraire des mutations
     if not lots_ref:
-        print("⚠️  Aucun lot dans l'immeuble de référence, extraction depuis les mutations...")
+        log.info("⚠️  Aucun lot dans l'immeuble de référence, extraction depuis les mutations...")
         for mutation in mutations:
             mut_data = mutation.get('mutations', {})
             immeubles_mut = mut_data.get('immeubles', {})
@@ -267,11 +356,11 @@ def reconstituer_propriete(mutations, immeubles):
                 lots_mutation = immeubles_mut.get('lots', [])
                 lots_ref.update(lots_mutation)
         
-        print(f"📋 Lots extraits des mutations : {sorted(lots_ref) if lots_ref else 'Aucun'}")
+        log.info("📋 Lots extraits des mutations : %s", sorted(lots_ref) if lots_ref else 'Aucun')
         
         if not lots_ref:
             # Dernière tentative : utiliser tous les lots trouvés dans les mutations pour cette commune
-            print("🔍 Recherche de tous les lots dans les mutations pour cette commune...")
+            log.debug("🔍 Recherche de tous les lots dans les mutations pour cette commune...")
             for mutation in mutations:
                 mut_data = mutation.get('mutations', {})
                 immeubles_mut = mut_data.get('immeubles', {})
@@ -280,43 +369,40 @@ def reconstituer_propriete(mutations, immeubles):
                     lots_ref.update(lots_mutation)
             
             if lots_ref:
-                print(f"📋 Lots trouvés dans toutes les mutations : {sorted(lots_ref)}")
+                log.info("📋 Lots trouvés dans toutes les mutations : %s", sorted(lots_ref))
             else:
-                print("ℹ️  Aucun lot spécifique trouvé, traitement de l'immeuble entier")
+                log.info("ℹ️  Aucun lot spécifique trouvé, traitement de l'immeuble entier")
                 # Ne pas retourner [] mais continuer avec lots_ref vide
                 # La logique gérera le cas "IMMEUBLE_ENTIER"
     
     # Trier les mutations par date (plus récentes en premier)
-    def convertir_date_pour_tri(date_str):
-        """Convertir DD/MM/YYYY en YYYY-MM-DD pour tri chronologique correct"""
+    def cle_tri_date(mutation):
+        """Clé (année, mois, jour) en entiers pour un tri chronologique ; (0, 0, 0) si la date est illisible"""
         try:
-            if '/' in date_str:
-                jour, mois, annee = date_str.split('/')
-                return f"{annee}-{mois.zfill(2)}-{jour.zfill(2)}"
-            return date_str
-        except:
-            return "0000-00-00"  # Date par défaut pour les erreurs
+            jour, mois, annee = mutation['date_depot'].split('/')
+            return (int(annee), int(mois), int(jour))
+        except (ValueError, AttributeError):
+            return (0, 0, 0)  # Date par défaut pour les erreurs
     
-    mutations_triees = sorted(mutations, 
-                             key=lambda x: convertir_date_pour_tri(x['date_depot']), 
-                             reverse=True)
+    mutations_triees = sorted(mutations, key=cle_tri_date, reverse=True)
     
-    print(f"📅 Mutations triées par date (plus récentes en premier)")
+    log.debug("📅 Mutations triées par date (plus récentes en premier)")
     
     # Debug : afficher l'ordre des dates après tri
-    print("🔍 Ordre chronologique des mutations :")
+    log.debug("🔍 Ordre chronologique des mutations :")
     for i, mut in enumerate(mutations_triees):
-        print(f"   {i+1}. {mut['date_depot']} - {mut['nature_acte'][:50]}...")
+        log.debug("   %d. %s - %s...", i + 1, mut['date_depot'], mut['nature_acte'][:50])
     
     # Structure pour suivre la propriété de chaque lot
     propriete_lots = {}  # lot_id -> {"proprietaire": {...}, "droits": "...", "date_acquisition": "..."}
     
     # Itérer sur les mutations triées
     for i, mutation in enumerate(mutations_triees):
-        print(f"\n📄 Mutation {i+1}/{len(mutations_triees)} - {mutation['date_depot']} : {mutation['nature_acte']}")
+        log.debug("\n📄 Mutation %d/%d - %s : %s", i + 1, len(mutations_triees), mutation['date_depot'], mutation['nature_acte'])
         
         mut_data = mutation.get('mutations', {})
         immeubles_mut = mut_data.get('immeubles', {})
+        date_cle = cle_tri_date(mutation)
         
         # Vérifier si cette mutation concerne notre immeuble de référence
         # Si pas d'immeubles dans la mutation, considérer qu'elle concerne l'immeuble de référence
@@ -328,7 +414,7 @@ def reconstituer_propriete(mutations, immeubles):
         else:
             # Cas où les immeubles de la mutation sont vides : considérer que ça concerne l'immeuble de référence
             concerne_immeuble = True
-            print(f"   ℹ️  Pas d'immeubles spécifiés dans la mutation, considère l'immeuble de référence")
+            log.debug("   ℹ️  Pas d'immeubles spécifiés dans la mutation, considère l'immeuble de référence")
         
         if concerne_immeuble:
             
@@ -337,11 +423,11 @@ def reconstituer_propriete(mutations, immeubles):
             # Si pas de lots spécifiques (ni dans référence ni dans mutation), considérer que ça concerne l'immeuble entier
             if not lots_ref and not lots_mutation:
                 lots_concernes = {'IMMEUBLE_ENTIER'}  # Marqueur pour immeuble sans lots
-                print(f"   ✅ Concerne l'immeuble entier : {designation_ref}")
+                log.debug("   ✅ Concerne l'immeuble entier : %s", designation_ref)
             else:
                 lots_concernes = lots_ref.intersection(lots_mutation)
                 if lots_concernes:
-                    print(f"   ✅ Concerne les lots : {sorted(lots_concernes)}")
+                    log.debug("   ✅ Concerne les lots : %s", sorted(lots_concernes))
             
             if lots_concernes:
                 # Identifier les bénéficiaires avec leurs droits spécifiques
@@ -349,6 +435,12 @@ def reconstituer_propriete(mutations, immeubles):
                 lignes_detaillees = immeubles_mut.get('lignes_detaillees', [])
                 
                 if beneficiaires and lignes_detaillees:
+                    # Index des bénéficiaires par numéro (le premier de chaque numéro l'emporte)
+                    beneficiaires_par_numero = {
+                        beneficiaire.get('numero', ''): beneficiaire
+                        for beneficiaire in reversed(beneficiaires)
+                    }
+                    
                     # Associer chaque ligne d'immeuble avec le bon bénéficiaire
                     for ligne_immeuble in lignes_detaillees:
                         numero_beneficiaire = ligne_immeuble.get('beneficiaire_numero', '')
@@ -363,11 +455,7 @@ def reconstituer_propriete(mutations, immeubles):
                         
                         if lots_ligne_concernes:
                             # Trouver le bénéficiaire correspondant
-                            beneficiaire_correspondant = None
-                            for beneficiaire in beneficiaires:
-                                if beneficiaire.get('numero', '') == numero_beneficiaire:
-                                    beneficiaire_correspondant = beneficiaire
-                                    break
+                            beneficiaire_correspondant = beneficiaires_par_numero.get(numero_beneficiaire)
                             
                             if beneficiaire_correspondant:
                                 # Attribuer la propriété aux lots concernés
@@ -381,13 +469,14 @@ def reconstituer_propriete(mutations, immeubles):
                                             },
                                             "droits": droits_ligne,
                                             "date_acquisition": mutation['date_depot'],
+                                            "date_cle": date_cle,
                                             "nature_acte": mutation['nature_acte'],
                                             "numero_ordre_mutation": mutation['numero_ordre']
                                         }
                                         if lot == 'IMMEUBLE_ENTIER':
-                                            print(f"      → Immeuble entier attribué à {beneficiaire_correspondant.get('designation', '')} ({beneficiaire_correspondant.get('date_naissance', '')}) - {droits_ligne}")
+                                            log.debug("      → Immeuble entier attribué à %s (%s) - %s", beneficiaire_correspondant.get('designation', ''), beneficiaire_correspondant.get('date_naissance', ''), droits_ligne)
                                         else:
-                                            print(f"      → Lot {lot} attribué à {beneficiaire_correspondant.get('designation', '')} ({beneficiaire_correspondant.get('date_naissance', '')}) - {droits_ligne}")
+                                            log.debug("      → Lot %s attribué à %s (%s) - %s", lot, beneficiaire_correspondant.get('designation', ''), beneficiaire_correspondant.get('date_naissance', ''), droits_ligne)
                 elif beneficiaires:
                     # Fallback : utiliser la méthode simple si pas de lignes détaillées
                     beneficiaire = beneficiaires[0]  # Premier bénéficiaire
@@ -404,25 +493,26 @@ def reconstituer_propriete(mutations, immeubles):
                                 },
                                 "droits": droits,
                                 "date_acquisition": mutation['date_depot'],
+                                "date_cle": date_cle,
                                 "nature_acte": mutation['nature_acte'],
                                 "numero_ordre_mutation": mutation['numero_ordre']
                             }
                             if lot == 'IMMEUBLE_ENTIER':
-                                print(f"      → Immeuble entier attribué à {beneficiaire.get('designation', '')} ({droits})")
+                                log.debug("      → Immeuble entier attribué à %s (%s)", beneficiaire.get('designation', ''), droits)
                             else:
-                                print(f"      → Lot {lot} attribué à {beneficiaire.get('designation', '')} ({droits})")
+                                log.debug("      → Lot %s attribué à %s (%s)", lot, beneficiaire.get('designation', ''), droits)
             else:
-                print(f"   ❌ Ne concerne pas les lots de référence")
+                log.debug("   ❌ Ne concerne pas les lots de référence")
         else:
-            print(f"   ❌ Ne concerne pas l'immeuble de référence")
+            log.debug("   ❌ Ne concerne pas l'immeuble de référence")
         
         # Vérifier si tous les lots sont attribués
         lots_attribues = set(propriete_lots.keys())
         if lots_ref and lots_attribues == lots_ref:
-            print(f"\n🎉 Tous les lots sont attribués ! Arrêt de l'analyse.")
+            log.info("\n🎉 Tous les lots sont attribués ! Arrêt de l'analyse.")
             break
         elif not lots_ref and 'IMMEUBLE_ENTIER' in lots_attribues:
-            print(f"\n🎉 Immeuble entier attribué ! Arrêt de l'analyse.")
+            log.info("\n🎉 Immeuble entier attribué ! Arrêt de l'analyse.")
             break
     
     # Construire le résultat final
@@ -433,17 +523,18 @@ def reconstituer_propriete(mutations, immeubles):
         proprietaires = {}
         for lot, info in propriete_lots.items():
             prop_key = f"{info['proprietaire']['designation']}_{info['proprietaire']['date_naissance']}"
-            if prop_key not in proprietaires:
-                proprietaires[prop_key] = {
-                    "proprietaire": info['proprietaire'],
-                    "lots": [],
-                    "droits": info['droits'],
-                    "date_acquisition_plus_recente": info['date_acquisition']
-                }
-            proprietaires[prop_key]['lots'].append(lot)
-            # Garder la date la plus récente
-            if info['date_acquisition'] > proprietaires[prop_key]['date_acquisition_plus_recente']:
-                proprietaires[prop_key]['date_acquisition_plus_recente'] = info['date_acquisition']
+            prop_info = proprietaires.setdefault(prop_key, {
+                "proprietaire": info['proprietaire'],
+                "lots": [],
+                "droits": info['droits'],
+                "date_acquisition_plus_recente": info['date_acquisition'],
+                "date_cle_plus_recente": info['date_cle']
+            })
+            prop_info['lots'].append(lot)
+            # Garder la date la plus récente (comparaison chronologique, pas sur la chaîne JJ/MM/AAAA)
+            if info['date_cle'] > prop_info['date_cle_plus_recente']:
+                prop_info['date_acquisition_plus_recente'] = info['date_acquisition']
+                prop_info['date_cle_plus_recente'] = info['date_cle']
         
         # Convertir en liste
         for prop_info in proprietaires.values():
@@ -468,7 +559,7 @@ def reconstituer_propriete(mutations, immeubles):
     # Identifier les lots non attribués
     lots_non_attribues = lots_ref - set(propriete_lots.keys())
     if lots_non_attribues:
-        print(f"\n⚠️  Lots non attribués : {sorted(lots_non_attribues)}")
+        log.info("\n⚠️  Lots non attribués : %s", sorted(lots_non_attribues))
         propriete_actuelle.append({
             "immeuble": {
                 "commune": commune_ref,
@@ -485,9 +576,9 @@ def reconstituer_propriete(mutations, immeubles):
             "date_acquisition": ""
         })
     
-    print(f"\n📊 Propriété reconstituée : {len(propriete_actuelle)} propriétaire(s)")
+    log.info("\n📊 Propriété reconstituée : %d propriétaire(s)", len(propriete_actuelle))
     for prop in propriete_actuelle:
-        print(f"   - {prop['proprietaire']['designation']} : lots {prop['lots']} ({prop['droits']})")
+        log.info("   - %s : lots %s (%s)", prop['proprietaire']['designation'], prop['lots'], prop['droits'])
     
     return propriete_actuelle
 
@@ -496,8 +587,6 @@ def extraire_mutations(contenu: str) -> dict:
     Extraire les informations de mutation (Disposant/Donateur, Bénéficiaire/Donataire, Immeubles)
     pour les formalités autres que les hypothèques.
     """
-    import re
-    
     if not contenu:
         return {}
     
@@ -507,162 +596,116 @@ def extraire_mutations(contenu: str) -> dict:
         "immeubles": {}
     }
     
-    try:
-        # 1. Extraire les Disposants/Donateurs
-        disposant_patterns = [
-            r"Disposant[,\s]*Donateur\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Bénéficiaire|\n\s*Immeubles|$)",
-            r"Disposant\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Bénéficiaire|\n\s*Immeubles|$)",
-            r"Donateur\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Bénéficiaire|\n\s*Immeubles|$)"
-        ]
-        
-        for pattern in disposant_patterns:
-            disposant_match = re.search(pattern, contenu, re.IGNORECASE | re.DOTALL)
-            if disposant_match:
-                disposant_text = disposant_match.group(1).strip()
-                # Extraire les lignes avec numéro, nom, date (plus flexible pour gérer apostrophes et espaces)
-                lignes_disposant = re.findall(r'(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})', disposant_text)
-                for numero, nom, date_naissance in lignes_disposant:
-                    mutations["disposant_donateur"].append({
-                        "numero": numero.strip(),
-                        "designation": nom.strip(),
-                        "date_naissance": date_naissance.strip()
-                    })
-                break
-        
-        # Si pas trouvé avec les patterns standards, essayer une approche plus simple
-        if not mutations["disposant_donateur"]:
-            # Chercher "Disposant" suivi de données tabulaires
-            simple_disposant = re.search(r"Disposant.*?\n.*?(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})", contenu, re.IGNORECASE | re.DOTALL)
-            if simple_disposant:
-                mutations["disposant_donateur"].append({
-                    "numero": simple_disposant.group(1).strip(),
-                    "designation": simple_disposant.group(2).strip(),
-                    "date_naissance": simple_disposant.group(3).strip()
-                })
-        
-        # 2. Extraire les Bénéficiaires/Donataires
-        beneficiaire_patterns = [
-            r"Bénéficiaire[,\s]*Donataire\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Immeubles|$)",
-            r"Bénéficiaire\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Immeubles|$)",
-            r"Donataire\s*.*?Numéro\s+Désignation des personnes\s+Date de naissance.*?\n(.*?)(?=\n\s*Immeubles|$)"
-        ]
-        
-        for pattern in beneficiaire_patterns:
-            beneficiaire_match = re.search(pattern, contenu, re.IGNORECASE | re.DOTALL)
-            if beneficiaire_match:
-                beneficiaire_text = beneficiaire_match.group(1).strip()
-                # Extraire les lignes avec numéro, nom, date (plus flexible)
-                lignes_beneficiaire = re.findall(r'(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})', beneficiaire_text)
-                for numero, nom, date_ou_siret in lignes_beneficiaire:
-                    mutations["beneficiaire_donataire"].append({
-                        "numero": numero.strip(),
-                        "designation": nom.strip(),
-                        "date_naissance": date_ou_siret.strip()
-                    })
-                break
-        
-        # Si pas trouvé avec les patterns standards, essayer une approche plus simple
-        if not mutations["beneficiaire_donataire"]:
-            # Chercher "Bénéficiaire" suivi de données tabulaires
-            simple_beneficiaire = re.search(r"Bénéficiaire.*?\n.*?(\d+)\s+([A-Z\'][A-Z\s\']+?)\s+(\d{2}/\d{2}/\d{4}|\d{3}\s+\d{3}\s+\d{3})", contenu, re.IGNORECASE | re.DOTALL)
-            if simple_beneficiaire:
-                mutations["beneficiaire_donataire"].append({
-                    "numero": simple_beneficiaire.group(1).strip(),
-                    "designation": simple_beneficiaire.group(2).strip(),
-                    "date_naissance": simple_beneficiaire.group(3).strip()
-                })
-        
-        # 3. Extraire le tableau Immeubles
-        immeubles_patterns = [
-            # Pattern 1: Format standard avec en-têtes complets
-            r"Immeubles\s*.*?Bénéficiaires\s+Droits\s+Commune\s+Désignation cadastrale\s+Volume\s+Lot\s*\n(.*?)(?=\n\s*US\s*:|$)",
-            # Pattern 2: Format simplifié (comme dans EHF8)
-            r"Immeubles\s*\n\s*Bénéficiaires\s+Droits\s+Commune\s+Désignation cadastrale\s+Volume\s+Lot\s*\n(.*?)(?=\n\s*[A-Z]{2,}\s*:|$)"
-        ]
-        
-        immeubles_text = ""
-        for pattern in immeubles_patterns:
-            immeubles_match = re.search(pattern, contenu, re.IGNORECASE | re.DOTALL)
-            if immeubles_match:
-                immeubles_text = immeubles_match.group(1).strip()
-                break
+    # 1. Extraire les Disposants/Donateurs
+    disposant_match = _DISPOSANT_RE.search(contenu)
+    if disposant_match:
+        disposant_text = disposant_match.group(1)
+        # Extraire les lignes avec numéro, nom, date (plus flexible pour gérer apostrophes et espaces)
+        lignes_disposant = _PERSONNE_RE.findall(disposant_text)
+        for numero, nom, date_naissance in lignes_disposant:
+            mutations["disposant_donateur"].append({
+                "numero": numero,
+                "designation": nom.strip(),
+                "date_naissance": date_naissance
+            })
+    
+    # Si pas trouvé avec les patterns standards, essayer une approche plus simple
+    if not mutations["disposant_donateur"]:
+        # Chercher "Disposant" suivi de données tabulaires
+        simple_disposant = _DISPOSANT_SIMPLE_RE.search(contenu)
+        if simple_disposant:
+            mutations["disposant_donateur"].append({
+                "numero": simple_disposant.group(1),
+                "designation": simple_disposant.group(2).strip(),
+                "date_naissance": simple_disposant.group(3)
+            })
+    
+    # 2. Extraire les Bénéficiaires/Donataires
+    beneficiaire_match = _BENEFICIAIRE_RE.search(contenu)
+    if beneficiaire_match:
+        beneficiaire_text = beneficiaire_match.group(1)
+        # Extraire les lignes avec numéro, nom, date (plus flexible)
+        lignes_beneficiaire = _PERSONNE_RE.findall(beneficiaire_text)
+        for numero, nom, date_ou_siret in lignes_beneficiaire:
+            mutations["beneficiaire_donataire"].append({
+                "numero": numero,
+                "designation": nom.strip(),
+                "date_naissance": date_ou_siret
+            })
+    
+    # Si pas trouvé avec les patterns standards, essayer une approche plus simple
+    if not mutations["beneficiaire_donataire"]:
+        # Chercher "Bénéficiaire" suivi de données tabulaires
+        simple_beneficiaire = _BENEFICIAIRE_SIMPLE_RE.search(contenu)
+        if simple_beneficiaire:
+            mutations["beneficiaire_donataire"].append({
+                "numero": simple_beneficiaire.group(1),
+                "designation": simple_beneficiaire.group(2).strip(),
+                "date_naissance": simple_beneficiaire.group(3)
+            })
+    
+    # 3. Extraire le tableau Immeubles
+    immeubles_match = _IMMEUBLES_MUTATION_RE.search(contenu)
+    immeubles_text = immeubles_match.group(1).strip() if immeubles_match else ""
+    
+    if immeubles_text:
+        # Extraire toutes les lignes du tableau immeubles
+        lignes_immeubles = []
         
-        if immeubles_text:
-            # Extraire toutes les lignes du tableau immeubles
-            lignes_immeubles = []
-            
-            # Patterns pour extraire les lignes individuelles
-            ligne_patterns = [
-                # Pattern 1: Format standard avec lots sur lignes séparées
-                r'(\d+(?:\s+à\s+\d+)?)\s+([A-Z/]{1,3})\s+([A-Z\s\d]+?)\s+([A-Z]{1,3}\s*\d+)\s*\n((?:\s*\d+\s*\n?)*)',
-                # Pattern 2: Format avec droits longs (US, NI, TP, etc.)
-                r'(\d+(?:\s+à\s+\d+)?)\s+([A-Z]{2,})\s+([A-Z\s\d]+?)\s+([A-Z]{1,3}\s*\d+)\s*\n((?:\s*\d+\s*\n?)*)'
-            ]
+        # Chercher toutes les lignes du tableau
+        for match in _LIGNE_IMMEUBLE_RE.finditer(immeubles_text):
+            numero_beneficiaire = match.group(1)
+            droits = match.group(2)
+            commune = match.group(3).strip()  # Peut capter un espace si la commune est vide
+            designation_cadastrale = match.group(4)
+            lots_text = match.group(5) if match.group(5) else ""
             
-            # Chercher toutes les lignes du tableau
-            for ligne_pattern in ligne_patterns:
-                matches = re.finditer(ligne_pattern, immeubles_text, re.MULTILINE)
-                for match in matches:
-                    numero_beneficiaire = match.group(1).strip()
-                    droits = match.group(2).strip()
-                    commune = match.group(3).strip()
-                    designation_cadastrale = match.group(4).strip()
-                    lots_text = match.group(5) if match.group(5) else ""
-                    
-                    # Extraire les lots
-                    lots = re.findall(r'\d+', lots_text) if lots_text else []
-                    
-                    lignes_immeubles.append({
-                        "beneficiaire_numero": numero_beneficiaire,
-                        "droits": droits,
-                        "commune": commune,
-                        "designation_cadastrale": designation_cadastrale,
-                        "volume": "",
-                        "lots": lots
-                    })
-                
-                if lignes_immeubles:
-                    break
+            # Extraire les lots (le groupe ne contient que des chiffres et des espaces)
+            lots = lots_text.split()
             
-            # Si on a trouvé des lignes, garder la structure détaillée
-            if lignes_immeubles:
-                # Prendre la première ligne comme référence principale
-                premiere_ligne = lignes_immeubles[0]
-                
-                # Fusionner tous les lots de toutes les lignes pour la recherche
-                tous_les_lots = []
-                for ligne in lignes_immeubles:
-                    tous_les_lots.extend(ligne["lots"])
-                
-                mutations["immeubles"] = {
-                    "beneficiaire_numero": premiere_ligne["beneficiaire_numero"],
-                    "droits": premiere_ligne["droits"],  # Garder les droits de la première ligne
-                    "commune": premiere_ligne["commune"],
-                    "designation_cadastrale": premiere_ligne["designation_cadastrale"],
-                    "volume": "",
-                    "lots": list(dict.fromkeys(tous_les_lots)),  # Tous les lots pour la recherche
-                    "lignes_detaillees": lignes_immeubles  # Détail complet pour analyse fine
-                }
-        
-        # 4. Extraire le montant/prix
-        montant_patterns = [
-            r"Prix/évaluation\s*:\s*([0-9\s,\.]+\s*EUR)",
-            r"Prix\s*:\s*([0-9\s,\.]+\s*EUR)",
-            r"Évaluation\s*:\s*([0-9\s,\.]+\s*EUR)",
-            r"Montant\s*:\s*([0-9\s,\.]+\s*EUR)"
-        ]
-        
-        for pattern in montant_patterns:
-            montant_match = re.search(pattern, contenu, re.IGNORECASE)
-            if montant_match:
-                mutations["montant"] = montant_match.group(1).strip()
-                break
+            lignes_immeubles.append({
+                "beneficiaire_numero": numero_beneficiaire,
+                "droits": droits,
+                "commune": commune,
+                "designation_cadastrale": designation_cadastrale,
+                "volume": "",
+                "lots": lots
+            })
         
-        if "montant" not in mutations:
-            mutations["montant"] = ""
+        # Si on a trouvé des lignes, garder la structure détaillée
+        if lignes_immeubles:
+            # Prendre la première ligne comme référence principale
+            premiere_ligne = lignes_immeubles[0]
+            
+            # Fusionner tous les lots de toutes les lignes pour la recherche,
+            # sans doublons et dans l'ordre d'apparition
+            lots_vus = set()
+            tous_les_lots = []
+            for ligne in lignes_immeubles:
+                for lot in ligne["lots"]:
+                    if lot not in lots_vus:
+                        lots_vus.add(lot)
+                        tous_les_lots.append(lot)
+            
+            mutations["immeubles"] = {
+                "beneficiaire_numero": premiere_ligne["beneficiaire_numero"],
+                "droits": premiere_ligne["droits"],  # Garder les droits de la première ligne
+                "commune": premiere_ligne["commune"],
+                "designation_cadastrale": premiere_ligne["designation_cadastrale"],
+                "volume": "",
+                "lots": tous_les_lots,  # Tous les lots pour la recherche
+                "lignes_detaillees": lignes_immeubles  # Détail complet pour analyse fine
+            }
     
-    except Exception as e:
-        print(f"⚠️  Erreur lors de l'extraction des mutations: {e}")
+    # 4. Extraire le montant/prix
+    for prix_re in _PRIX_RES:
+        montant_match = prix_re.search(contenu)
+        if montant_match:
+            mutations["montant"] = montant_match.group(1).strip()
+            break
+    
+    if "montant" not in mutations:
+        mutations["montant"] = ""
     
     return mutations
 
@@ -671,7 +714,6 @@ def extraire_lots_volumes_hypotheque(contenu: str) -> dict:
     Extraire les lots et volumes concernés par l'hypothèque depuis le contenu.
     Analyse le tableau "Immeubles" dans le contenu de la formalité.
     """
-    import re
     
     if not contenu:
         return {"lots": [], "volume": "", "commune": "", "designation_cadastrale": ""}
@@ -682,182 +724,135 @@ def extraire_lots_volumes_hypotheque(contenu: str) -> dict:
     commune = ""
     designation_cadastrale = ""
     
-    try:
-        # Chercher la section "Immeubles" dans le contenu
-        # Pattern pour trouver la section immeubles jusqu'au montant
-        immeubles_pattern = r"Immeubles\s*.*?(?=\n\s*Montant|$)"
-        immeubles_match = re.search(immeubles_pattern, contenu, re.IGNORECASE | re.DOTALL)
+    # Chercher la section "Immeubles" dans le contenu, jusqu'au montant.
+    # Sans section (cas le plus courant), tout le tableau est ignoré
+    immeubles_match = _DEBUT_SECTION_IMMEUBLES_RE.search(contenu)
+    
+    if immeubles_match:
+        fin_match = _FIN_SECTION_IMMEUBLES_RE.search(contenu, immeubles_match.end())
+        if fin_match:
+            fin = fin_match.start()
+        else:
+            # Sans montant, la section va jusqu'à la fin (sans le dernier saut de ligne)
+            fin = len(contenu) - 1 if contenu.endswith("\n") else len(contenu)
+        section_immeubles = contenu[immeubles_match.start():max(fin, immeubles_match.end())]
         
-        if immeubles_match:
-            section_immeubles = immeubles_match.group(0)
-            
-            # Méthode 1: Chercher le pattern "COMMUNE DESIGNATION\nNUMEROS"
-            # Exemple: "PARIS 15 CJ 42\n17\n57"
-            pattern_commune_designation = r"([A-Z][A-Z\s\d]+?)\s+([A-Z]{1,3}\s*\d+)\s*\n((?:\s*\d+\s*\n?)+)"
-            match_commune_designation = re.search(pattern_commune_designation, section_immeubles)
+        # Méthode 1: Chercher le pattern "COMMUNE DESIGNATION\nNUMEROS"
+        # Exemple: "PARIS 15 CJ 42\n17\n57"
+        match_commune_designation = _COMMUNE_DESIGNATION_RE.search(section_immeubles)
+        
+        if match_commune_designation:
+            commune = match_commune_designation.group(1).strip()  # Une commune d'une lettre capte l'espace suivant
+            designation_cadastrale = match_commune_designation.group(2)
+            lots_text = match_commune_designation.group(3)
+            lots = lots_text.split()  # Uniquement des chiffres et des espaces
+        else:
+            # Méthode 2: Chercher séparément
+            # Extraire la commune (patterns comme "PARIS 15", "VANVES")
+            for commune_re in _COMMUNE_RES:
+                commune_match = commune_re.search(section_immeubles)
+                if commune_match:
+                    commune = commune_match.group(1).strip()
+                    break
             
-            if match_commune_designation:
-                commune = match_commune_designation.group(1).strip()
-                designation_cadastrale = match_commune_designation.group(2).strip()
-                lots_text = match_commune_designation.group(3)
-                lots = re.findall(r'\d+', lots_text)
-            else:
-                # Méthode 2: Chercher séparément
-                # Extraire la commune (patterns comme "PARIS 15", "VANVES")
-                commune_patterns = [
-                    r"([A-Z][A-Z\s\d]+?)\s+[A-Z]{1,3}\s+\d+",  # "PARIS 15 CJ 42"
-                    r"Commune[:\s]*([A-Z][A-Z\s\d]+)",  # "Commune: VANVES"
-                ]
-                
-                for pattern in commune_patterns:
-                    commune_match = re.search(pattern, section_immeubles, re.IGNORECASE)
-                    if commune_match:
-                        commune = commune_match.group(1).strip()
-                        break
-                
-                # Extraire la désignation cadastrale (patterns comme "CJ 42", "O 32")
-                designation_patterns = [
-                    r"([A-Z]{1,3}\s*\d+)(?:\s*\n|\s*$)",  # "CJ 42" suivi d'un saut de ligne
-                    r"cadastrale[:\s]*([A-Z]{1,3}\s*\d+)",  # "cadastrale: CJ 42"
-                ]
-                
-                for pattern in designation_patterns:
-                    designation_match = re.search(pattern, section_immeubles, re.IGNORECASE)
-                    if designation_match:
-                        designation_cadastrale = designation_match.group(1).strip()
-                        break
-                
-                # Extraire les lots (numéros isolés après la désignation)
-                if designation_cadastrale:
-                    # Chercher après la désignation cadastrale
-                    after_designation = section_immeubles.split(designation_cadastrale, 1)
-                    if len(after_designation) > 1:
-                        remaining_text = after_designation[1]
-                        # Chercher les numéros isolés sur des lignes séparées
-                        lots = re.findall(r'^\s*(\d+)\s*$', remaining_text, re.MULTILINE)
+            # Extraire la désignation cadastrale (patterns comme "CJ 42", "O 32")
+            for designation_re in _DESIGNATION_RES:
+                designation_match = designation_re.search(section_immeubles)
+                if designation_match:
+                    designation_cadastrale = designation_match.group(1)
+                    break
             
-            # Extraire le volume s'il existe (rare mais possible)
-            volume_pattern = r"Volume[:\s]*(\d+|[A-Z]\d+)"
-            volume_match = re.search(volume_pattern, section_immeubles, re.IGNORECASE)
-            if volume_match:
-                volume = volume_match.group(1).strip()
+            # Extraire les lots (numéros isolés après la désignation)
+            if designation_cadastrale:
+                # Chercher après la désignation cadastrale
+                idx = section_immeubles.find(designation_cadastrale)
+                if idx >= 0:
+                    # Chercher les numéros isolés sur des lignes séparées
+                    remaining_text = section_immeubles[idx + len(designation_cadastrale):]
+                    lots = _LOT_ISOLE_RE.findall(remaining_text)
         
-        # Nettoyer et valider les résultats
-        lots = [lot.strip() for lot in lots if lot.strip().isdigit()]
-        lots = list(dict.fromkeys(lots))  # Supprimer les doublons en gardant l'ordre
+        # Extraire le volume s'il existe (rare mais possible)
+        volume_match = _VOLUME_RE.search(section_immeubles)
+        if volume_match:
+            volume = volume_match.group(1)
         
-        # Debug pour comprendre ce qui se passe
-        if not lots and "Immeubles" in contenu:
-            print(f"🔍 DEBUG - Section immeubles trouvée mais pas de lots extraits")
-            print(f"🔍 DEBUG - Commune: '{commune}', Designation: '{designation_cadastrale}'")
+        # Nettoyer et valider les résultats (un seul strip par lot,
+        # doublons supprimés en gardant l'ordre)
+        lots = list(dict.fromkeys(lot for lot in map(str.strip, lots) if lot.isdigit()))
         
-    except Exception as e:
-        print(f"⚠️  Erreur lors de l'extraction des lots/volumes: {e}")
+        # Debug pour comprendre ce qui se passe
+        if not lots:
+            log.debug("🔍 DEBUG - Section immeubles trouvée mais pas de lots extraits")
+            log.debug("🔍 DEBUG - Commune: '%s', Designation: '%s'", commune, designation_cadastrale)
     
     # Extraire les informations financières après le tableau immeubles
-    montant_principal = ""
-    accessoires = ""
-    taux_interet = ""
-    date_extreme_exigibilite = ""
-    date_extreme_effet = ""
+    # (montant principal, accessoires, taux d'intérêt, dates d'extrême exigibilité et d'effet)
+    finances = {}
     complement = ""
     
-    try:
-        # Chercher les informations financières après "Montant principal"
-        montant_pattern = r"Montant principal\s*:\s*([\d\s,\.]+\s*EUR)"
-        montant_match = re.search(montant_pattern, contenu, re.IGNORECASE)
-        if montant_match:
-            montant_principal = montant_match.group(1).strip()
-        
-        # Accessoires
-        accessoires_pattern = r"Accessoires\s*:\s*([\d\s,\.]+\s*EUR)"
-        accessoires_match = re.search(accessoires_pattern, contenu, re.IGNORECASE)
-        if accessoires_match:
-            accessoires = accessoires_match.group(1).strip()
-        
-        # Taux d'intérêt
-        taux_pattern = r"Taux d'intérêt\s*:\s*([\d,\.]+\s*%)"
-        taux_match = re.search(taux_pattern, contenu, re.IGNORECASE)
-        if taux_match:
-            taux_interet = taux_match.group(1).strip()
-        
-        # Date d'extrême exigibilité
-        exigibilite_pattern = r"Date d'extrême exigibilité\s*:\s*(\d{2}/\d{2}/\d{4})"
-        exigibilite_match = re.search(exigibilite_pattern, contenu, re.IGNORECASE)
-        if exigibilite_match:
-            date_extreme_exigibilite = exigibilite_match.group(1).strip()
-        
-        # Date d'extrême effet
-        effet_pattern = r"Date d'extrême effet\s*:\s*(\d{2}/\d{2}/\d{4})"
-        effet_match = re.search(effet_pattern, contenu, re.IGNORECASE)
-        if effet_match:
-            date_extreme_effet = effet_match.group(1).strip()
-        
-        # Complément (après "Complément :" jusqu'à "Disposition" ou fin de formalité)
-        complement_pattern = r"Complément\s*:\s*(.*?)(?=\n\s*Disposition|\n\s*\d+\s*/\s*\d+\s*Demande|$)"
-        complement_match = re.search(complement_pattern, contenu, re.IGNORECASE | re.DOTALL)
-        if complement_match:
-            complement = complement_match.group(1).strip()
-            # Nettoyer le complément (supprimer les sauts de ligne excessifs)
-            complement = re.sub(r'\n+', ' ', complement).strip()
+    for champ_match in _CHAMPS_FINANCIERS_RE.finditer(contenu):
+        champ = champ_match.lastgroup
+        if champ not in finances:
+            finances[champ] = champ_match.group(champ).strip()
+            if len(finances) == 5:
+                break
     
-    except Exception as e:
-        print(f"⚠️  Erreur lors de l'extraction des informations financières: {e}")
+    # Complément (après "Complément :" jusqu'à "Disposition" ou fin de formalité)
+    complement_match = _COMPLEMENT_RE.search(contenu)
+    if complement_match:
+        complement = complement_match.group(1)
+        # Nettoyer le complément (supprimer les sauts de ligne excessifs, puis les bords)
+        complement = _SAUTS_LIGNE_RE.sub(' ', complement).strip()
     
     return {
         "lots": lots,
         "volume": volume,
         "commune": commune,
         "designation_cadastrale": designation_cadastrale,
-        "montant_principal": montant_principal,
-        "accessoires": accessoires,
-        "taux_interet": taux_interet,
-        "date_extreme_exigibilite": date_extreme_exigibilite,
-        "date_extreme_effet": date_extreme_effet,
+        "montant_principal": finances.get("montant_principal", ""),
+        "accessoires": finances.get("accessoires", ""),
+        "taux_interet": finances.get("taux_interet", ""),
+        "date_extreme_exigibilite": finances.get("date_extreme_exigibilite", ""),
+        "date_extreme_effet": finances.get("date_extreme_effet", ""),
         "complement": complement
     }
 
+@lru_cache(maxsize=1024)
 def classifier_type_acte(nature_acte: str) -> str:
     """
     Extraire le type d'acte en prenant tout ce qui est avant "de la formalité" 
     s'il existe, sinon prendre tout le contenu de nature_acte_redacteur.
     """
-    import re
     nature_acte_original = nature_acte.strip()
     
-    # Chercher "de la formalité" (avec variations possibles)
-    patterns_formalite = [
-        r'\s+de\s+la\s+formalité',
-        r'\s+de\s+la\s+formalite', 
-        r'\s+DE\s+LA\s+FORMALITÉ',
-        r'\s+DE\s+LA\s+FORMALITE'
-    ]
-    
-    for pattern in patterns_formalite:
-        match = re.search(pattern, nature_acte_original, re.IGNORECASE)
-        if match:
-            # Extraire tout ce qui est avant "de la formalité"
-            type_acte = nature_acte_original[:match.start()].strip()
-            return type_acte if type_acte else nature_acte_original
+    # Chercher "de la formalité" (accentué ou non, toutes casses)
+    match = _FORMALITE_RE.search(nature_acte_original)
+    if match:
+        # Extraire tout ce qui est avant "de la formalité"
+        type_acte = nature_acte_original[:match.start()].strip()
+        return type_acte if type_acte else nature_acte_original
     
     # Si "de la formalité" n'est pas trouvé, retourner tout le contenu
     return nature_acte_original
 
-def extract_tableau_derniere_page(pdf_path: str) -> List[Dict[str, Any]]:
+def extract_tableau_derniere_page(pdf_source: Union[str, BinaryIO]) -> List[Dict[str, Any]]:
     """
     Extraire le tableau des immeubles de la dernière page uniquement.
+    Accepte un chemin ou un flux binaire (BytesIO, fichier ouvert en "rb").
     """
+    # Import différé : pdfplumber (et pdfminer) ne sert qu'ici et pèse lourd au chargement
+    import pdfplumber
     
-    print(f"🏠 Extraction du tableau de la dernière page depuis : {pdf_path}")
+    log.info("🏠 Extraction du tableau de la dernière page depuis : %s", getattr(pdf_source, "name", pdf_source))
     
     immeubles = []
     
-    with pdfplumber.open(pdf_path) as pdf:
+    with pdfplumber.open(pdf_source) as pdf:
         total_pages = len(pdf.pages)
         last_page = pdf.pages[-1]
         page_num = total_pages
         
-        print(f"🔍 Analyse de la dernière page ({page_num}) sur {total_pages}")
+        log.debug("🔍 Analyse de la dernière page (%d) sur %d", page_num, total_pages)
         
         # Configuration spécifique pour détecter les tableaux
         table_settings = {
@@ -883,8 +878,8 @@ def extract_tableau_derniere_page(pdf_path: str) -> List[Dict[str, Any]]:
                 
                 # Vérifier si c'est la ligne d'en-tête
                 row_text = ' '.join(str(cell) for cell in row if cell)
-                if any(keyword in row_text.upper() for keyword in ["CODE", "COMMUNE", "DESIGNATION"]):
-                    print(f"📋 En-têtes trouvés à la ligne {row_idx}: {row}")
+                if _EN_TETE_TABLEAU_RE.search(row_text):
+                    log.debug("📋 En-têtes trouvés à la ligne %d: %s", row_idx, row)
                     
                     # Extraire les données suivantes
                     for data_row_idx in range(row_idx + 1, len(table)):
@@ -892,13 +887,17 @@ def extract_tableau_derniere_page(pdf_path: str) -> List[Dict[str, Any]]:
                         if not data_row or not any(cell for cell in data_row):
                             continue
                         
-                        # Mapper les colonnes
+                        # Mapper les colonnes (ligne complétée à 5 cellules si elle est plus courte)
+                        cellules = (list(data_row[:5]) + [""] * 5)[:5]
+                        code, commune, designation, volume, lot = (
+                            str(cell).strip() if cell else "" for cell in cellules
+                        )
                         immeuble = {
-                            "code": str(data_row[0]).strip() if len(data_row) > 0 and data_row[0] else "",
-                            "commune": str(data_row[1]).strip() if len(data_row) > 1 and data_row[1] else "",
-                            "designation_cadastrale": str(data_row[2]).strip() if len(data_row) > 2 and data_row[2] else "",
-                            "volume": str(data_row[3]).strip() if len(data_row) > 3 and data_row[3] else "",
-                            "lot": str(data_row[4]).strip() if len(data_row) > 4 and data_row[4] else "",
+                            "code": code,
+                            "commune": commune,
+                            "designation_cadastrale": designation,
+                            "volume": volume,
+                            "lot": lot,
                             "_page": page_num
                         }
                         
@@ -922,8 +921,7 @@ def extract_tableau_derniere_page(pdf_path: str) -> List[Dict[str, Any]]:
                                             start = int(parts[0].strip())
                                             end = int(parts[1].strip())
                                             # Générer tous les nombres de la plage
-                                            for num in range(start, end + 1):
-                                                processed_volumes.append(str(num))
+                                            processed_volumes.extend(map(str, range(start, end + 1)))
                                         except ValueError:
                                             # Si conversion échoue, garder tel quel
                                             processed_volumes.append(volume_part)
@@ -937,39 +935,42 @@ def extract_tableau_derniere_page(pdf_path: str) -> List[Dict[str, Any]]:
                         # Ne garder que les lignes avec au moins un code ou une commune
                         if immeuble["code"] or immeuble["commune"]:
                             immeubles.append(immeuble)
-                            print(f"🏠 Immeuble extrait : {immeuble}")
+                            log.debug("🏠 Immeuble extrait : %s", immeuble)
     
-    print(f"🏠 {len(immeubles)} immeubles extraits de la dernière page")
+    log.info("🏠 %d immeubles extraits de la dernière page", len(immeubles))
     return immeubles
 
-def extraction_complete_ehf(pdf_path: str, output_dir: str = "extractions") -> Dict[str, str]:
+def extraction_complete_ehf(pdf_source: Union[str, BinaryIO], output_dir: str = "extractions") -> Dict[str, str]:
     """
     Extraction complète d'un EHF : formalités + tableau dernière page.
     
     Args:
-        pdf_path: Chemin vers le PDF EHF
+        pdf_source: Chemin vers le PDF EHF, ou flux binaire (BytesIO, fichier ouvert en "rb")
         output_dir: Dossier de sortie pour les fichiers JSON
     
     Returns:
         Dictionnaire avec les chemins des fichiers générés
     """
     
-    print(f"🚀 EXTRACTION COMPLÈTE EHF")
-    print(f"📄 Fichier source : {pdf_path}")
-    print("=" * 80)
+    log.info("🚀 EXTRACTION COMPLÈTE EHF")
+    log.info("📄 Fichier source : %s", pdf_source)
+    log.info("=" * 80)
     
     # Créer le dossier de sortie
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Nom de base pour les fichiers de sortie
-    pdf_name = Path(pdf_path).stem
+    # Nom de base pour les fichiers de sortie (un flux en mémoire n'a pas forcément de nom)
+    if isinstance(pdf_source, str):
+        pdf_name = Path(pdf_source).stem
+    else:
+        pdf_name = Path(getattr(pdf_source, "name", None) or "document").stem
     
     # 1. Extraire les formalités
-    print("\n📋 ÉTAPE 1: Extraction des formalités")
-    print("-" * 50)
+    log.info("\n📋 ÉTAPE 1: Extraction des formalités")
+    log.info("-" * 50)
     
-    formalites, comptage_types, hypotheques_actives, mutations = extract_formalites_from_pdf(pdf_path)
+    formalites, comptage_types, hypotheques_actives, mutations = extract_formalites_from_pdf(pdf_source)
     
     # Créer la structure finale avec formalités + statistiques + hypothèques actives + mutations
     structure_finale = {
@@ -986,69 +987,65 @@ def extraction_complete_ehf(pdf_path: str, output_dir: str = "extractions") -> D
         }
     }
     
-    # Sauvegarder les formalités avec statistiques
-    formalites_file = output_path / f"{pdf_name}_formalites.json"
-    with open(formalites_file, 'w', encoding='utf-8') as f:
-        json.dump(structure_finale, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ Formalités avec statistiques sauvegardées : {formalites_file}")
-    
     # 2. Extraire le tableau de la dernière page
-    print("\n🏠 ÉTAPE 2: Extraction du tableau de la dernière page")
-    print("-" * 50)
+    log.info("\n🏠 ÉTAPE 2: Extraction du tableau de la dernière page")
+    log.info("-" * 50)
     
-    immeubles = extract_tableau_derniere_page(pdf_path)
+    # Un chemin est rouvert par pdfplumber (relecture servie par le cache du système) ;
+    # un flux déjà lu par PyPDF2 est rembobiné
+    if not isinstance(pdf_source, str):
+        pdf_source.seek(0)
+    immeubles = extract_tableau_derniere_page(pdf_source)
     
     # Sauvegarder les immeubles
     immeubles_file = output_path / f"{pdf_name}_immeubles_derniere_page.json"
-    with open(immeubles_file, 'w', encoding='utf-8') as f:
-        json.dump(immeubles, f, ensure_ascii=False, indent=2)
+    immeubles_file.write_bytes(orjson.dumps(immeubles, option=orjson.OPT_INDENT_2))
     
-    print(f"✅ Immeubles sauvegardés : {immeubles_file}")
+    log.info("✅ Immeubles sauvegardés : %s", immeubles_file)
     
     # 3. Résumé
-    print("\n📊 RÉSUMÉ DE L'EXTRACTION")
-    print("=" * 80)
-    print(f"📋 Formalités extraites : {len(formalites)}")
-    print(f"🏠 Immeubles extraits : {len(immeubles)}")
-    print(f"📁 Fichiers générés dans : {output_path}")
+    log.info("\n📊 RÉSUMÉ DE L'EXTRACTION")
+    log.info("=" * 80)
+    log.info("📋 Formalités extraites : %d", len(formalites))
+    log.info("🏠 Immeubles extraits : %d", len(immeubles))
+    log.info("📁 Fichiers générés dans : %s", output_path)
     
     # Afficher quelques exemples
     if formalites:
-        print(f"\n📋 Exemple de formalité :")
+        log.info("\n📋 Exemple de formalité :")
         exemple_formalite = formalites[0]
-        print(f"   - Numéro ordre : {exemple_formalite['numero_ordre']}")
-        print(f"   - Date dépôt : {exemple_formalite['date_depot']}")
-        print(f"   - Date acte : {exemple_formalite['date_acte']}")
-        print(f"   - Nature acte : {exemple_formalite['nature_acte_redacteur'][:50]}...")
+        log.info("   - Numéro ordre : %s", exemple_formalite['numero_ordre'])
+        log.info("   - Date dépôt : %s", exemple_formalite['date_depot'])
+        log.info("   - Date acte : %s", exemple_formalite['date_acte'])
+        log.info("   - Nature acte : %s...", exemple_formalite['nature_acte_redacteur'][:50])
     
     if comptage_types:
-        print(f"\n📊 Top 3 des types d'actes :")
+        log.info("\n📊 Top 3 des types d'actes :")
         for i, (type_acte, count) in enumerate(list(comptage_types.items())[:3]):
-            print(f"   {i+1}. {type_acte}: {count} formalité(s)")
+            log.info("   %d. %s: %d formalité(s)", i + 1, type_acte, count)
     
     if hypotheques_actives:
-        print(f"\n🏦 Hypothèques actives :")
+        log.info("\n🏦 Hypothèques actives :")
         for hyp in hypotheques_actives[:3]:  # Afficher les 3 premières
-            print(f"   - {hyp['date_depot']} : {hyp['nature_acte'][:50]}...")
+            log.info("   - %s : %s...", hyp['date_depot'], hyp['nature_acte'][:50])
     
     if mutations:
-        print(f"\n🔄 Mutations :")
+        log.info("\n🔄 Mutations :")
         for mut in mutations[:3]:  # Afficher les 3 premières
-            print(f"   - {mut['date_depot']} : {mut['nature_acte'][:50]}...")
+            log.info("   - %s : %s...", mut['date_depot'], mut['nature_acte'][:50])
     
     if immeubles:
-        print(f"\n🏠 Exemple d'immeuble :")
+        log.info("\n🏠 Exemple d'immeuble :")
         exemple_immeuble = immeubles[0]
-        print(f"   - Code : {exemple_immeuble['code']}")
-        print(f"   - Commune : {exemple_immeuble['commune']}")
-        print(f"   - Désignation : {exemple_immeuble['designation_cadastrale']}")
-        print(f"   - Volume : {exemple_immeuble['volume']}")
-        print(f"   - Lot : {exemple_immeuble['lot']}")
+        log.info("   - Code : %s", exemple_immeuble['code'])
+        log.info("   - Commune : %s", exemple_immeuble['commune'])
+        log.info("   - Désignation : %s", exemple_immeuble['designation_cadastrale'])
+        log.info("   - Volume : %s", exemple_immeuble['volume'])
+        log.info("   - Lot : %s", exemple_immeuble['lot'])
     
     # 3. Reconstituer la propriété actuelle des immeubles
-    print("\n🏗️ ÉTAPE 3: Reconstitution de la propriété")
-    print("-" * 50)
+    log.info("\n🏗️ ÉTAPE 3: Reconstitution de la propriété")
+    log.info("-" * 50)
     
     propriete_actuelle = reconstituer_propriete(mutations, immeubles)
     
@@ -1056,9 +1053,11 @@ def extraction_complete_ehf(pdf_path: str, output_dir: str = "extractions") -> D
     structure_finale["propriete_actuelle"] = propriete_actuelle
     structure_finale["statistiques"]["propriete_reconstituee"] = len(propriete_actuelle) > 0
     
-    # Re-sauvegarder avec la propriété
-    with open(formalites_file, 'w', encoding='utf-8') as f:
-        json.dump(structure_finale, f, ensure_ascii=False, indent=2)
+    # Sauvegarder les formalités avec statistiques et propriété (une seule écriture)
+    formalites_file = output_path / f"{pdf_name}_formalites.json"
+    formalites_file.write_bytes(orjson.dumps(structure_finale, option=orjson.OPT_INDENT_2))
+    
+    log.info("✅ Formalités avec statistiques sauvegardées : %s", formalites_file)
     
     return {
         "formalites_file": str(formalites_file),
@@ -1076,11 +1075,24 @@ def extraction_complete_ehf(pdf_path: str, output_dir: str = "extractions") -> D
 def main():
     """Fonction principale."""
     
-    # Chemin vers le PDF à analyser
-    pdf_path = "EHFs/EHF8.pdf"  # Remplace par ton fichier
+    # En ligne de commande, afficher les messages d'avancement (niveau INFO)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    # PDF à analyser : fichiers ou dossiers passés en argument, sinon le fichier par défaut
+    arguments = sys.argv[1:] or ["EHFs/EHF8.pdf"]  # Remplace par ton fichier
+    output_dir = "extractions_ehf"
     
-    if not Path(pdf_path).exists():
-        print(f"❌ Fichier non trouvé : {pdf_path}")
+    pdf_paths = []
+    for argument in arguments:
+        chemin = Path(argument)
+        if chemin.is_dir():
+            pdf_paths.extend(str(p) for p in sorted(chemin.glob("*.pdf")))
+        elif chemin.exists():
+            pdf_paths.append(argument)
+        else:
+            print(f"❌ Fichier non trouvé : {argument}")
+    
+    if not pdf_paths:
         print("📝 Fichiers disponibles dans EHFs/:")
         ehf_dir = Path("EHFs")
         if ehf_dir.exists():
@@ -1088,18 +1100,39 @@ def main():
                 print(f"   - {file.name}")
         return
     
-    try:
-        # Lancer l'extraction complète
-        resultats = extraction_complete_ehf(pdf_path, output_dir="extractions_ehf")
-        
-        print(f"\n🎉 EXTRACTION TERMINÉE AVEC SUCCÈS !")
-        print(f"📋 Formalités : {resultats['formalites_file']}")
-        print(f"🏠 Immeubles : {resultats['immeubles_file']}")
-        
-    except Exception as e:
-        print(f"❌ Erreur lors de l'extraction : {e}")
-        import traceback
-        traceback.print_exc()
+    if len(pdf_paths) == 1:
+        pdf_path = pdf_paths[0]
+        try:
+            # Lancer l'extraction complète
+            resultats = extraction_complete_ehf(pdf_path, output_dir=output_dir)
+            
+            print(f"\n🎉 EXTRACTION TERMINÉE AVEC SUCCÈS !")
+            print(f"📋 Formalités : {resultats['formalites_file']}")
+            print(f"🏠 Immeubles : {resultats['immeubles_file']}")
+            
+        except Exception as e:
+            print(f"❌ Erreur lors de l'extraction : {e}")
+            import traceback
+            traceback.print_exc()
+        return
+    
+    # Plusieurs EHF : extraction en parallèle, un processus par cœur.
+    # Les workers ne journalisent que les avertissements (ni avancement ni résumé),
+    # pour ne pas mélanger les sorties des différents EHF
+    print(f"🚀 Extraction de {len(pdf_paths)} EHF en parallèle")
+    echecs = 0
+    with ProcessPoolExecutor(initializer=logging.disable, initargs=(logging.INFO,)) as pool:
+        futures = {pool.submit(extraction_complete_ehf, pdf_path, output_dir): pdf_path for pdf_path in pdf_paths}
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                resultats = future.result()
+                print(f"✅ {pdf_path} → {resultats['formalites_file']}, {resultats['immeubles_file']}")
+            except Exception as e:
+                echecs += 1
+                print(f"❌ Erreur lors de l'extraction de {pdf_path} : {e}")
+    
+    print(f"\n🎉 {len(pdf_paths) - echecs}/{len(pdf_paths)} EHF extraits dans : {output_dir}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,28 @@
+"""
+Configuration gunicorn pour la production : plusieurs workers uvicorn.
+
+Lancement : gunicorn app:app -c gunicorn_conf.py
+"""
+
+import multiprocessing
+import os
+
+bind = "0.0.0.0:1000"
+
+# Un worker web par cœur (uvloop + httptools sélectionnés automatiquement par UvicornWorker)
+workers = int(os.environ.get("EHF_WORKERS") or multiprocessing.cpu_count())
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Recycler les workers pour plafonner la croissance mémoire due au parsing des PDF
+max_requests = 1000
+max_requests_jitter = 50
+
+# Pas de preload : chaque worker doit créer son propre pool d'extraction
+# (un ProcessPoolExecutor hérité du maître partagerait ses pipes entre workers)
+preload_app = False
+
+# Chaque worker web a son pool d'extraction : répartir les cœurs pour ne pas
+# lancer workers × cpu_count processus d'extraction
+raw_env = [
+    f"EHF_EXTRACTION_WORKERS={max(1, multiprocessing.cpu_count() // workers)}",
+]
@@ -0,0 +1,48 @@
+"""Lecture du tableau "Immeubles" des mutations (extraire_mutations)."""
+
+import unittest
+
+from extraction_complete import extraire_mutations
+
+EN_TETE = "Immeubles\nBénéficiaires Droits Commune Désignation cadastrale Volume Lot\n"
+
+
+def lignes(contenu: str) -> list:
+    """(numéro, droits, commune, désignation, lots) de chaque ligne du tableau."""
+    immeubles = extraire_mutations(contenu)["immeubles"]
+    return [
+        (l["beneficiaire_numero"], l["droits"], l["commune"], l["designation_cadastrale"], l["lots"])
+        for l in immeubles.get("lignes_detaillees", [])
+    ]
+
+
+class LignesImmeublesTest(unittest.TestCase):
+
+    def test_droits_longs_et_courts_dans_la_meme_section(self):
+        contenu = EN_TETE + (
+            "1 USUFRUIT PARIS 15 CJ 42\n17\n"
+            "2 PP PARIS 15 CJ 42\n9\n57\n"
+        )
+        self.assertEqual(lignes(contenu), [
+            ("1", "USUFRUIT", "PARIS 15", "CJ 42", ["17"]),
+            ("2", "PP", "PARIS 15", "CJ 42", ["9", "57"]),
+        ])
+
+    def test_texte_avant_le_tableau_ignore(self):
+        contenu = EN_TETE + "2007 DONATION PARIS\n1 PP PARIS 15 CJ 42\n17\n"
+        self.assertEqual(lignes(contenu), [("1", "PP", "PARIS 15", "CJ 42", ["17"])])
+
+    def test_numero_de_ligne_suivante_pas_pris_pour_un_lot(self):
+        contenu = EN_TETE + "1 TP PARIS 15 CJ 42\n17\n57\n2 US PARIS 15 CJ 42\n9\n"
+        self.assertEqual(lignes(contenu), [
+            ("1", "TP", "PARIS 15", "CJ 42", ["17", "57"]),
+            ("2", "US", "PARIS 15", "CJ 42", ["9"]),
+        ])
+
+    def test_commune_vide(self):
+        contenu = EN_TETE + "1 PP   CJ 42\n17\n"
+        self.assertEqual(lignes(contenu), [("1", "PP", "", "CJ 42", ["17"])])
+
+
+if __name__ == "__main__":
+    unittest.main()